@@ -2,10 +2,9 @@
 Customer Churn Prediction Application
 A modern Streamlit app for predicting customer churn using Deep Learning.
 """
+import logging
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict
+from typing import TYPE_CHECKING, Tuple
 import sys
 from pathlib import Path
 
@@ -20,10 +19,15 @@ from config import (
     SUCCESS_COLOR,
     WARNING_COLOR,
     DANGER_COLOR,
-    CHURN_THRESHOLD,
-    INPUT_RANGES
+    INPUT_RANGES,
+    STYLES_PATH
 )
-from utils import get_model_loader
+from utils import CustomerInputs, get_model_loader
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+logger = logging.getLogger(__name__)
 
 # Page configuration
 st.set_page_config(
@@ -33,55 +37,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+
+@st.cache_data
+def _load_css() -> str:
+    """Read the custom stylesheet once and reuse it across reruns."""
+    return STYLES_PATH.read_text(encoding="utf-8")
+
+
 # Custom CSS for better styling
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .sub-header {
-        font-size: 1.2rem;
-        color: #666;
-        text-align: center;
-        margin-bottom: 3rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 5px solid #1f77b4;
-    }
-    .stButton>button {
-        width: 100%;
-        background-color: #1f77b4;
-        color: white;
-        font-weight: bold;
-        border-radius: 5px;
-        padding: 0.5rem 1rem;
-    }
-    .stButton>button:hover {
-        background-color: #1565c0;
-    }
-    .prediction-result {
-        padding: 2rem;
-        border-radius: 10px;
-        text-align: center;
-        margin-top: 2rem;
-    }
-    .churn-high {
-        background-color: #ffebee;
-        border: 2px solid #e74c3c;
-    }
-    .churn-low {
-        background-color: #e8f5e9;
-        border: 2px solid #2ecc71;
-    }
-    </style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
 
 
 @st.cache_resource
@@ -94,11 +58,21 @@ def load_model():
         st.stop()
 
 
-def create_probability_gauge(probability: float) -> go.Figure:
-    """Create a gauge chart for churn probability."""
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_predict(inputs: CustomerInputs) -> Tuple[float, bool]:
+    """Predict churn for the given inputs, reusing results for repeated inputs."""
+    return load_model().predict(inputs)
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def create_probability_gauge(probability: float) -> "go.Figure":
+    """Create a gauge chart for churn probability (cached per rounded probability)."""
+    import plotly.graph_objects as go
+    
     fig = go.Figure(go.Indicator(
         mode="gauge+number+delta",
         value=probability * 100,
+        number={'valueformat': '.0f'},
         domain={'x': [0, 1], 'y': [0, 1]},
         title={'text': "Churn Probability (%)"},
         delta={'reference': 50},
@@ -125,15 +99,18 @@ def create_probability_gauge(probability: float) -> go.Figure:
     return fig
 
 
-def create_probability_bar(probability: float) -> go.Figure:
-    """Create a horizontal bar chart for churn probability."""
-    colors = [DANGER_COLOR if probability > CHURN_THRESHOLD else SUCCESS_COLOR]
+@st.cache_resource(max_entries=128, show_spinner=False)
+def create_probability_bar(probability: float, will_churn: bool) -> "go.Figure":
+    """Create a horizontal bar chart for churn probability (cached per rounded probability)."""
+    import plotly.graph_objects as go
+    
+    colors = [DANGER_COLOR if will_churn else SUCCESS_COLOR]
     fig = go.Figure(go.Bar(
         x=[probability * 100],
         y=['Churn Risk'],
         orientation='h',
         marker=dict(color=colors),
-        text=[f"{probability * 100:.2f}%"],
+        text=[f"{probability * 100:.0f}%"],
         textposition='inside',
         textfont=dict(size=20, color='white')
     ))
@@ -160,22 +137,27 @@ def main():
     # Load model
     model_loader = load_model()
     
-    # Sidebar for inputs
-    with st.sidebar:
+    # Select box options are constant, so resolve them once per session
+    if 'geo_options' not in st.session_state:
+        st.session_state.geo_options = list(model_loader.geo_categories)
+        st.session_state.gender_options = list(model_loader.gender_classes)
+    
+    # Sidebar for inputs; the form defers reruns until it is submitted
+    with st.sidebar.form("customer_form", clear_on_submit=False):
         st.header("📝 Customer Information")
         st.markdown("---")
         
         # Geography
         geography = st.selectbox(
             "🌍 Geography",
-            options=model_loader.one_hot_encoder.categories_[0],
+            options=st.session_state.geo_options,
             help="Select the customer's country"
         )
         
         # Gender
         gender = st.selectbox(
             "👤 Gender",
-            options=model_loader.label_encoder_gender.classes_,
+            options=st.session_state.gender_options,
             help="Select the customer's gender"
         )
         
@@ -262,6 +244,13 @@ def main():
         is_active_member = 1 if is_active_member_option == "Yes" else 0
         
         st.markdown("---")
+        
+        # Predict button
+        submitted = st.form_submit_button(
+            "🔮 Predict Churn",
+            type="primary",
+            use_container_width=True
+        )
     
     # Main content area
     col1, col2 = st.columns([2, 1])
@@ -270,35 +259,39 @@ def main():
         st.header("📊 Prediction Results")
         
         # Prepare input data
-        input_data: Dict = {
-            'geography': geography,
-            'gender': gender,
-            'age': age,
-            'credit_score': credit_score,
-            'balance': balance,
-            'estimated_salary': estimated_salary,
-            'tenure': tenure,
-            'num_of_products': num_of_products,
-            'has_cr_card': has_cr_card,
-            'is_active_member': is_active_member
-        }
+        input_data = CustomerInputs(
+            credit_score=credit_score,
+            gender=gender,
+            age=age,
+            tenure=tenure,
+            balance=balance,
+            num_of_products=num_of_products,
+            has_cr_card=has_cr_card,
+            is_active_member=is_active_member,
+            estimated_salary=estimated_salary,
+            geography=geography
+        )
         
-        # Predict button
-        if st.button("🔮 Predict Churn", type="primary", use_container_width=True):
+        if submitted:
             with st.spinner("Analyzing customer data..."):
                 try:
-                    probability, will_churn = model_loader.predict(input_data)
+                    probability, will_churn = cached_predict(input_data)
+                    st.session_state.last_prediction = {
+                        'probability': probability,
+                        'will_churn': will_churn,
+                        'inputs': input_data
+                    }
                     
                     # Display results
                     st.markdown("---")
                     
                     # Probability gauge
                     st.subheader("Churn Probability")
-                    fig_gauge = create_probability_gauge(probability)
+                    fig_gauge = create_probability_gauge(round(probability, 2))
                     st.plotly_chart(fig_gauge, use_container_width=True)
                     
                     # Probability bar
-                    fig_bar = create_probability_bar(probability)
+                    fig_bar = create_probability_bar(round(probability, 2), will_churn)
                     st.plotly_chart(fig_bar, use_container_width=True)
                     
                     # Result message
@@ -344,33 +337,42 @@ def main():
                         """)
                     
                 except Exception as e:
-                    st.error(f"An error occurred during prediction: {str(e)}")
-                    st.exception(e)
+                    logger.exception("Prediction failed")
+                    st.error(f"Prediction failed: {e}")
     
     with col2:
         st.header("📈 Customer Summary")
         st.markdown("---")
         
-        # Display input summary
-        st.metric("Age", f"{age} years")
-        st.metric("Credit Score", f"{credit_score}")
-        st.metric("Balance", f"${balance:,.2f}")
-        st.metric("Salary", f"${estimated_salary:,.2f}")
-        st.metric("Tenure", f"{tenure} years")
-        st.metric("Products", f"{num_of_products}")
-        
-        st.markdown("---")
-        
-        # Additional info
-        info_dict = {
-            "Geography": geography,
-            "Gender": gender,
-            "Credit Card": "Yes" if has_cr_card else "No",
-            "Active Member": "Yes" if is_active_member else "No"
-        }
-        
-        for key, value in info_dict.items():
-            st.text(f"{key}: {value}")
+        # Only render the summary once a prediction has been made
+        if 'last_prediction' not in st.session_state:
+            st.info("Submit to see summary")
+        else:
+            last_prediction = st.session_state.last_prediction
+            inputs = last_prediction['inputs']
+            
+            # Display input summary
+            st.metric("Churn Probability", f"{last_prediction['probability'] * 100:.2f}%")
+            st.metric("Age", f"{inputs.age} years")
+            st.metric("Credit Score", f"{inputs.credit_score}")
+            st.metric("Balance", f"${inputs.balance:,.2f}")
+            st.metric("Salary", f"${inputs.estimated_salary:,.2f}")
+            st.metric("Tenure", f"{inputs.tenure} years")
+            st.metric("Products", f"{inputs.num_of_products}")
+            
+            st.markdown("---")
+            
+            # Additional info
+            info_dict = {
+                "Geography": inputs.geography,
+                "Gender": inputs.gender,
+                "Credit Card": "Yes" if inputs.has_cr_card else "No",
+                "Active Member": "Yes" if inputs.is_active_member else "No",
+                "Verdict": "High risk" if last_prediction['will_churn'] else "Low risk"
+            }
+            
+            for key, value in info_dict.items():
+                st.text(f"{key}: {value}")
     
     # Footer
     st.markdown("---")
@@ -9,10 +9,17 @@ BASE_DIR = Path(__file__).parent
 
 # Model and preprocessor paths
 MODEL_PATH = BASE_DIR / 'model.h5'
+TFLITE_MODEL_PATH = BASE_DIR / 'model.tflite'
 LABEL_ENCODER_GENDER_PATH = BASE_DIR / 'label_encoder_gender.pkl'
 ONE_HOT_ENCODER_PATH = BASE_DIR / 'OHE.pkl'
 SCALER_PATH = BASE_DIR / 'scaler.pkl'
 
+# Preprocessing parameters exported from the pickles by export_params.py
+PREPROCESSOR_PARAMS_PATH = BASE_DIR / 'prep.npz'
+
+# Stylesheet path
+STYLES_PATH = BASE_DIR / 'styles.css'
+
 # App configuration
 APP_TITLE = "Customer Churn Prediction"
 APP_ICON = "📊"
@@ -27,6 +34,9 @@ DANGER_COLOR = "#e74c3c"
 # Churn threshold
 CHURN_THRESHOLD = 0.5
 
+# Maximum number of predictions memoised by the model loader
+PREDICTION_CACHE_SIZE = 512
+
 # Input validation ranges
 INPUT_RANGES = {
     'age': {'min': 18, 'max': 100, 'default': 40},
@@ -0,0 +1,48 @@
+"""
+Export the fitted sklearn preprocessors to a plain NumPy archive.
+
+Run this once after retraining so the app can load the preprocessing
+parameters without unpickling sklearn objects:
+
+    python export_params.py
+"""
+import pickle
+
+import numpy as np
+
+from config import (
+    LABEL_ENCODER_GENDER_PATH,
+    ONE_HOT_ENCODER_PATH,
+    SCALER_PATH,
+    PREPROCESSOR_PARAMS_PATH
+)
+
+
+def export_params() -> None:
+    """Write scaler, gender encoder and geography encoder parameters to prep.npz."""
+    with open(LABEL_ENCODER_GENDER_PATH, 'rb') as f:
+        label_encoder_gender = pickle.load(f)
+    
+    with open(ONE_HOT_ENCODER_PATH, 'rb') as f:
+        one_hot_encoder = pickle.load(f)
+    
+    with open(SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+    
+    params = {}
+    if hasattr(scaler, 'feature_names_in_'):
+        params['feature_names'] = np.asarray(scaler.feature_names_in_, dtype=str)
+    
+    np.savez(
+        PREPROCESSOR_PARAMS_PATH,
+        **params,
+        mean=scaler.mean_.astype(np.float32),
+        scale=scaler.scale_.astype(np.float32),
+        gender_classes=np.asarray(label_encoder_gender.classes_, dtype=str),
+        geo_categories=np.asarray(one_hot_encoder.categories_[0], dtype=str)
+    )
+    print(f"Saved preprocessing parameters to {PREPROCESSOR_PARAMS_PATH}")
+
+
+if __name__ == "__main__":
+    export_params()
@@ -1,35 +1,109 @@
 """
 Utility functions for model loading and prediction.
 """
-import pickle
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Tuple, Optional
-import pandas as pd
+from typing import List, NamedTuple, Tuple, Optional
 import numpy as np
 import tensorflow as tf
-from sklearn.preprocessing import StandardScaler, LabelEncoder, OneHotEncoder
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from config import (
     MODEL_PATH,
-    LABEL_ENCODER_GENDER_PATH,
-    ONE_HOT_ENCODER_PATH,
-    SCALER_PATH
+    TFLITE_MODEL_PATH,
+    PREPROCESSOR_PARAMS_PATH,
+    PREDICTION_CACHE_SIZE,
+    CHURN_THRESHOLD,
+    INPUT_RANGES
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Non-geography feature columns, in the order the scaler was fitted on
+NUMERIC_FEATURES = [
+    'CreditScore',
+    'Gender',
+    'Age',
+    'Tenure',
+    'Balance',
+    'NumOfProducts',
+    'HasCrCard',
+    'IsActiveMember',
+    'EstimatedSalary'
+]
+
+
+class CustomerInputs(NamedTuple):
+    """Customer features for a single prediction.
+    
+    The first nine fields mirror NUMERIC_FEATURES position by position.
+    """
+    credit_score: int
+    gender: str
+    age: int
+    tenure: int
+    balance: float
+    num_of_products: int
+    has_cr_card: int
+    is_active_member: int
+    estimated_salary: float
+    geography: str
+
+
+def _prep_rows_loop(out, geo_idx, geo_offset, mean, inv_scale):
+    """One-hot encode Geography and standardise each row of ``out`` in place."""
+    n_rows, n_cols = out.shape
+    for i in range(n_rows):
+        for j in range(geo_offset, n_cols):
+            out[i, j] = 1.0 if j - geo_offset == geo_idx[i] else 0.0
+        for j in range(n_cols):
+            out[i, j] = (out[i, j] - mean[j]) * inv_scale[j]
+
+
+def _prep_rows_numpy(out, geo_idx, geo_offset, mean, inv_scale):
+    """Vectorised NumPy fallback for ``_prep_rows_loop`` when Numba is unavailable."""
+    out[:, geo_offset:] = 0.0
+    out[np.arange(out.shape[0]), geo_offset + geo_idx] = 1.0
+    np.subtract(out, mean, out=out)
+    np.multiply(out, inv_scale, out=out)
+
+
+if njit is not None:
+    _prep_rows = njit(cache=True, fastmath=True)(_prep_rows_loop)
+else:
+    _prep_rows = _prep_rows_numpy
+
 
 class ModelLoader:
     """Handles loading of the trained model and preprocessors."""
     
     def __init__(self):
         self.model = None
-        self.label_encoder_gender = None
-        self.one_hot_encoder = None
-        self.scaler = None
+        self.interpreter = None
+        self.input_index = None
+        self.output_index = None
+        self._predict_fn = None
+        # Guards the interpreter, input buffer and prediction cache shared across sessions
+        self._lock = threading.Lock()
+        self._batch_size = 1
+        self._row_buf = None
+        self.gender_classes = []
+        self.geo_categories = []
+        self.n_features = 0
+        self.feature_order = []
+        self._mean = None
+        self._inv_scale = None
+        self._gender_map = {}
+        self._geo_index = {}
+        self._geo_pred_cache: OrderedDict = OrderedDict()
         self._load_all()
     
     def _load_all(self) -> None:
@@ -38,14 +112,49 @@ class ModelLoader:
             logger.info("Loading model and preprocessors...")
             self.model = tf.keras.models.load_model(str(MODEL_PATH))
             
-            with open(LABEL_ENCODER_GENDER_PATH, 'rb') as f:
-                self.label_encoder_gender = pickle.load(f)
+            with np.load(PREPROCESSOR_PARAMS_PATH) as params:
+                self.gender_classes = params['gender_classes'].tolist()
+                self._gender_map = {c: i for i, c in enumerate(self.gender_classes)}
+                
+                self.geo_categories = params['geo_categories'].tolist()
+                self.n_features = len(NUMERIC_FEATURES) + len(self.geo_categories)
+                expected_order = NUMERIC_FEATURES + [
+                    f"Geography_{geo}" for geo in self.geo_categories
+                ]
+                if 'feature_names' in params.files:
+                    self.feature_order = params['feature_names'].tolist()
+                else:
+                    self.feature_order = expected_order
+                self._geo_index = {c: i for i, c in enumerate(self.geo_categories)}
+                
+                # Everything downstream stays float32, matching the trained model
+                self._mean = params['mean'].astype(np.float32, copy=False)
+                self._inv_scale = np.reciprocal(params['scale'], dtype=np.float32)
+            
+            # The row buffer is filled by position, so the scaler's columns must match
+            if self.feature_order != expected_order:
+                raise ValueError(
+                    f"Unexpected feature order {self.feature_order}, expected {expected_order}"
+                )
             
-            with open(ONE_HOT_ENCODER_PATH, 'rb') as f:
-                self.one_hot_encoder = pickle.load(f)
+            # Reusable input buffer; the first call also triggers JIT compilation
+            self._row_buf = np.zeros((1, self.n_features), dtype=np.float32)
+            _prep_rows(
+                self._row_buf,
+                np.zeros(1, dtype=np.intp),
+                len(NUMERIC_FEATURES),
+                self._mean,
+                self._inv_scale
+            )
             
-            with open(SCALER_PATH, 'rb') as f:
-                self.scaler = pickle.load(f)
+            try:
+                self._load_interpreter()
+            except Exception as e:
+                logger.warning(f"TFLite conversion failed, falling back to XLA: {e}")
+                self.interpreter = None
+                self._load_xla_fn()
+            
+            self._warm_up()
             
             logger.info("Successfully loaded all components")
         except FileNotFoundError as e:
@@ -55,49 +164,141 @@ class ModelLoader:
             logger.error(f"Error loading model/preprocessors: {e}")
             raise
     
-    def predict(self, input_data: Dict) -> Tuple[float, bool]:
+    def _load_interpreter(self) -> None:
+        """Build a TFLite interpreter from the Keras model, reusing the on-disk cache when fresh."""
+        if (TFLITE_MODEL_PATH.exists()
+                and TFLITE_MODEL_PATH.stat().st_mtime >= MODEL_PATH.stat().st_mtime):
+            tflite_model = TFLITE_MODEL_PATH.read_bytes()
+        else:
+            logger.info("Converting Keras model to TFLite...")
+            converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            tflite_model = converter.convert()
+            try:
+                TFLITE_MODEL_PATH.write_bytes(tflite_model)
+            except OSError as e:
+                logger.warning(f"Could not cache TFLite model: {e}")
+        
+        self.interpreter = tf.lite.Interpreter(model_content=tflite_model)
+        self.interpreter.allocate_tensors()
+        self.input_index = self.interpreter.get_input_details()[0]['index']
+        self.output_index = self.interpreter.get_output_details()[0]['index']
+    
+    def _load_xla_fn(self) -> None:
+        """Compile the Keras forward pass with XLA, used when TFLite is unavailable."""
+        self._predict_fn = tf.function(
+            lambda x: self.model(x, training=False),
+            jit_compile=True,
+            input_signature=[tf.TensorSpec([None, self.n_features], tf.float32)]
+        )
+        self._predict_fn(tf.zeros((1, self.n_features), tf.float32))
+    
+    def _warm_up(self) -> None:
+        """Run one dummy forward pass so the first real prediction is fast."""
+        try:
+            dummy = CustomerInputs(
+                credit_score=INPUT_RANGES['credit_score']['default'],
+                gender=self.gender_classes[0],
+                age=INPUT_RANGES['age']['default'],
+                tenure=INPUT_RANGES['tenure']['default'],
+                balance=float(INPUT_RANGES['balance']['default']),
+                num_of_products=INPUT_RANGES['num_of_products']['default'],
+                has_cr_card=0,
+                is_active_member=0,
+                estimated_salary=float(INPUT_RANGES['estimated_salary']['default']),
+                geography=self.geo_categories[0]
+            )
+            
+            # predict scores all geographies together, so warm up that batch shape
+            self.predict_batch([dummy._replace(geography=geo) for geo in self.geo_categories])
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+    
+    def predict(self, inputs: CustomerInputs) -> Tuple[float, bool]:
         """
         Predict churn probability for given input data.
         
         Args:
-            input_data: Dictionary containing customer features
+            inputs: Customer features
             
         Returns:
             Tuple of (probability, will_churn)
         """
-        try:
-            # Prepare input DataFrame
-            df = pd.DataFrame({
-                'CreditScore': [input_data['credit_score']],
-                'Gender': [self.label_encoder_gender.transform([input_data['gender']])[0]],
-                'Age': [input_data['age']],
-                'Tenure': [input_data['tenure']],
-                'Balance': [input_data['balance']],
-                'NumOfProducts': [input_data['num_of_products']],
-                'HasCrCard': [input_data['has_cr_card']],
-                'IsActiveMember': [input_data['is_active_member']],
-                'EstimatedSalary': [input_data['estimated_salary']]
-            })
-            
-            # One-hot encode Geography
-            geo_encoded = self.one_hot_encoder.transform([[input_data['geography']]])
-            geo_encoded_df = pd.DataFrame(
-                geo_encoded,
-                columns=self.one_hot_encoder.get_feature_names_out(['Geography'])
-            )
+        geo_idx = self._geo_index[inputs.geography]
+        
+        # Score every geography at once for these scalar inputs, so flipping
+        # only the geography is served from the cache
+        scalar_key = inputs[:len(NUMERIC_FEATURES)]
+        with self._lock:
+            geo_probs = self._geo_pred_cache.get(scalar_key)
+            if geo_probs is not None:
+                self._geo_pred_cache.move_to_end(scalar_key)
+        
+        if geo_probs is None:
+            rows = [inputs._replace(geography=geo) for geo in self.geo_categories]
+            geo_probs = self.predict_batch(rows)[:, 0]
             
-            # Combine data
-            df = pd.concat([df.reset_index(drop=True), geo_encoded_df], axis=1)
+            # Remember the result, evicting the least recently used entry when full
+            with self._lock:
+                self._geo_pred_cache[scalar_key] = geo_probs
+                if len(self._geo_pred_cache) > PREDICTION_CACHE_SIZE:
+                    self._geo_pred_cache.popitem(last=False)
+        
+        probability = float(geo_probs[geo_idx])
+        will_churn = probability > CHURN_THRESHOLD
+        
+        return probability, will_churn
+    
+    def predict_batch(self, rows: List[CustomerInputs]) -> np.ndarray:
+        """
+        Predict churn probabilities for several customers in one forward pass.
+        
+        Args:
+            rows: List of customer features
             
-            # Scale the data
-            df_scaled = self.scaler.transform(df)
+        Returns:
+            Array of shape (len(rows), 1) with churn probabilities
+        """
+        try:
+            batch_size = len(rows)
+            if batch_size == 0:
+                return np.empty((0, 1), dtype=np.float32)
             
-            # Predict
-            prediction = self.model.predict(df_scaled, verbose=0)
-            probability = float(prediction[0][0])
-            will_churn = probability > 0.5
+            geo_idx = np.fromiter(
+                (self._geo_index[r.geography] for r in rows),
+                dtype=np.intp,
+                count=batch_size
+            )
             
-            return probability, will_churn
+            # The input buffer and interpreter are shared, so hold the lock
+            # from filling the buffer through to reading the output
+            with self._lock:
+                # Resize the input buffer and interpreter only when the batch size changes
+                if batch_size != self._batch_size:
+                    if self.interpreter is not None:
+                        self.interpreter.resize_tensor_input(
+                            self.input_index, [batch_size, self.n_features]
+                        )
+                        self.interpreter.allocate_tensors()
+                    self._row_buf = np.empty((batch_size, self.n_features), dtype=np.float32)
+                    self._batch_size = batch_size
+                arr = self._row_buf
+                
+                # Fill the numeric columns in training column order in one assignment
+                arr[:, :len(NUMERIC_FEATURES)] = [
+                    (r.credit_score, self._gender_map[r.gender], *r[2:len(NUMERIC_FEATURES)])
+                    for r in rows
+                ]
+                
+                # One-hot encode Geography and scale in place: (x - mean) / scale
+                _prep_rows(arr, geo_idx, len(NUMERIC_FEATURES), self._mean, self._inv_scale)
+                
+                # Predict
+                if self.interpreter is None:
+                    return self._predict_fn(tf.constant(arr, dtype=tf.float32)).numpy()
+                self.interpreter.set_tensor(self.input_index, arr)
+                self.interpreter.invoke()
+                return self.interpreter.get_tensor(self.output_index)
             
         except Exception as e:
             logger.error(f"Error during prediction: {e}")